@@ -9,189 +9,667 @@ Time calculations use business hours (7am-7pm PST, Mon-Fri).
 from __future__ import annotations
 
 import argparse
+import functools
 import os
 import sys
-from typing import List, Dict, Any
-from datetime import datetime, timedelta
-import pytz
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Sequence
+from urllib.parse import parse_qs, urlparse
+from datetime import date, datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+import numpy as np
+import orjson
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from requests_cache import CachedSession
+from urllib3.util.retry import Retry
 
+#: Timezone business hours are measured in (PST/PDT).
+PST = ZoneInfo("America/Los_Angeles")
 
-def get_pst_timezone():
-    """Get PST/PDT timezone."""
-    return pytz.timezone('America/Los_Angeles')
+#: Business hours are 7am-7pm local time on weekdays.
+BUSINESS_DAY_START_HOUR = 7
+BUSINESS_DAY_END_HOUR = 19
+#: Hours counted for a weekend day on which an issue was opened or closed.
+WEEKEND_ACTIVITY_HOURS = 4.0
 
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+_HOUR_US = 3600 * 10**6
+_DAY_US = 24 * _HOUR_US
 
+#: Connections the shared session keeps open to api.github.com.
+HTTP_POOL_SIZE = 32
+#: Seconds a request waits for one of the HTTP_POOL_SIZE slots before failing.
+HTTP_POOL_TIMEOUT = 300
+#: Default number of issues analyzed concurrently (kept below the session's pool size).
+DEFAULT_WORKERS = 16
+
+#: Pages of one REST list fetched concurrently once the page count is known.
+MAX_PAGE_WORKERS = 4
+#: Page size for the timeline and events endpoints; per_page=100 makes GitHub's
+#: joins for busy issues slow enough to hit 502/504s.
+TIMELINE_PAGE_SIZE = 80
+
+#: SQLite file GET responses are cached in between runs; main() puts it next to
+#: --out unless --cache (or GITHUB_CACHE_FILE) names another file.
+HTTP_CACHE_FILE = "gh_cache.sqlite"
+#: Seconds before a cached response without Cache-Control headers is revalidated.
+HTTP_CACHE_EXPIRE_SECONDS = 3600
+
+#: Issues aliased into a single GraphQL query.
+GRAPHQL_ISSUE_BATCH_SIZE = 25
+#: Below this many remaining GraphQL points, wait for the rate limit to reset.
+GRAPHQL_RATE_LIMIT_LOW_WATERMARK = 50
+#: Below this many remaining REST requests, wait for the rate limit to reset.
+RATE_LIMIT_LOW_WATERMARK = 50
+#: Below this many remaining search requests (a separate 30/minute bucket),
+#: spread the rest evenly until the reset instead.
+SEARCH_RATE_LIMIT_LOW_WATERMARK = 10
+
+# Timeline items analyze_issue_timing looks at, fetched via GraphQL instead of
+# paging through both the REST timeline and events endpoints.
+ISSUE_TIMELINE_ITEM_TYPES = "[ISSUE_COMMENT, ASSIGNED_EVENT, LABELED_EVENT]"
+ISSUE_TIMELINE_FIELDS = """
+pageInfo { hasNextPage endCursor }
+nodes {
+  __typename
+  ... on IssueComment { createdAt author { login } }
+  ... on AssignedEvent { createdAt actor { login } }
+  ... on LabeledEvent { createdAt actor { login } }
+}
+"""
+
+ISSUE_TIMELINE_QUERY = f"""
+query($owner: String!, $repo: String!, $number: Int!, $cursor: String) {{
+  repository(owner: $owner, name: $repo) {{
+    issue(number: $number) {{
+      timelineItems(first: 100, after: $cursor, itemTypes: {ISSUE_TIMELINE_ITEM_TYPES}) {{ {ISSUE_TIMELINE_FIELDS} }}
+    }}
+  }}
+}}
+"""
+
+ISSUE_TIMELINE_FRAGMENT = f"""
+fragment timelineFields on Issue {{
+  timelineItems(first: 100, itemTypes: {ISSUE_TIMELINE_ITEM_TYPES}) {{ {ISSUE_TIMELINE_FIELDS} }}
+}}
+"""
+
+#: The Search API never returns more than this many results for one query.
+SEARCH_RESULT_LIMIT = 1000
+
+# Closed issues with every field the analysis needs, 100 per page
+CLOSED_ISSUES_SEARCH_QUERY = """
+query($query: String!, $cursor: String) {
+  search(type: ISSUE, query: $query, first: 100, after: $cursor) {
+    issueCount
+    pageInfo { hasNextPage endCursor }
+    nodes {
+      ... on Issue {
+        number title url createdAt closedAt
+        author { login }
+        comments { totalCount }
+        assignees(first: 1) { nodes { login } }
+        labels(first: 20) { nodes { name } }
+      }
+    }
+  }
+}
+"""
+
+# GraphQL timeline item types and the REST event names they correspond to
+GRAPHQL_EVENT_TYPES = {
+    "IssueComment": "commented",
+    "AssignedEvent": "assigned",
+    "LabeledEvent": "labeled",
+}
+
+
+def _json(response: requests.Response) -> Any:
+    """Decode a response body with orjson (faster than ``response.json()``)."""
+    return orjson.loads(response.content)
+
+
+def rate_limit_reset(response: requests.Response) -> float | None:
+    """When a request rejected by a rate limit may be resent, or None if it wasn't rejected.
+    
+    Covers both the primary limit (no requests remaining) and secondary limits
+    (a ``Retry-After`` header, sent even while requests remain).
+    """
+    if response.status_code not in (403, 429) or getattr(response, "from_cache", False):
+        return None
+    retry_after = response.headers.get("Retry-After")
+    if retry_after is not None:
+        return time.time() + float(retry_after)
+    if response.headers.get("X-RateLimit-Remaining") == "0":
+        return float(response.headers.get("X-RateLimit-Reset", time.time() + 60))
+    return None
+
+
+def _respect_rate_limit(response: requests.Response, *args, **kwargs) -> None:
+    """Response hook pacing requests by the X-RateLimit-* headers GitHub sends on every reply.
+    
+    Rejected requests are left to ``_request``: raising here would skip reading
+    the body, so the connection would never go back to the pool.
+    """
+    remaining = response.headers.get("X-RateLimit-Remaining")
+    if remaining is None or getattr(response, "from_cache", False) or rate_limit_reset(response):
+        # Cached responses carry the headers of when they were first fetched
+        return
+    remaining = int(remaining)
+    reset_at = float(response.headers.get("X-RateLimit-Reset", time.time() + 60))
+    
+    delay = reset_at - time.time()
+    if delay <= 0:
+        return
+    if response.headers.get("X-RateLimit-Resource") == "search":
+        if remaining < SEARCH_RATE_LIMIT_LOW_WATERMARK:
+            time.sleep(delay / max(remaining, 1))
+    elif remaining < RATE_LIMIT_LOW_WATERMARK:
+        print(f"Rate limit nearly exhausted ({remaining} left), waiting {delay:.0f}s for reset...",
+              file=sys.stderr)
+        time.sleep(delay)
+
+
+def create_session(cache_file: str) -> CachedSession:
+    """Build a session caching GET responses in ``cache_file``.
+    
+    Every request reuses pooled keep-alive connections instead of paying a new
+    TCP+TLS handshake; transient 5xx errors are retried with backoff. GET
+    responses are cached on disk and revalidated with their ETag once stale -
+    a 304 reply doesn't count against the rate limit. Whether a request carried
+    a token is part of its cache key, so token and tokenless runs never share
+    replies, but the token itself is left out of cache keys and stored requests.
+    """
+    session = CachedSession(
+        cache_file,
+        backend="sqlite",
+        cache_control=True,
+        expire_after=HTTP_CACHE_EXPIRE_SECONDS,
+        match_headers=["Authorization"],
+    )
+    session.headers.update({"Accept": "application/vnd.github+json"})
+    session.mount(
+        "https://",
+        HTTPAdapter(
+            pool_connections=HTTP_POOL_SIZE,
+            pool_maxsize=HTTP_POOL_SIZE,
+            max_retries=Retry(total=5, backoff_factor=1, status_forcelist=[502, 503, 504]),
+        ),
+    )
+    session.hooks["response"].append(_respect_rate_limit)
+    return session
+
+
+# Shared by every request, but only opened (creating its cache file) on first use
+_SESSION: CachedSession | None = None
+_SESSION_LOCK = threading.Lock()
+
+
+def get_session(cache_file: str | None = None) -> CachedSession:
+    """The shared session, created on first call with its cache in ``cache_file``.
+    
+    Defaults to HTTP_CACHE_FILE in the working directory; later calls return
+    the existing session whatever ``cache_file`` they pass.
+    """
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            _SESSION = create_session(cache_file or HTTP_CACHE_FILE)
+        return _SESSION
+
+
+# Issue workers times page workers can exceed the pool size, and connections
+# beyond it would be opened and thrown away. Requests wait for a slot instead;
+# slots are always released, unlike a pool connection whose body is never read.
+_HTTP_SLOTS = threading.BoundedSemaphore(HTTP_POOL_SIZE)
+
+
+class GraphQLError(Exception):
+    """A GraphQL query failed outright, returning errors and no data."""
+
+
+def _request(method: str, url: str, **kwargs) -> requests.Response:
+    """Send a request through the shared session, waiting out rate limits it was rejected by."""
+    while True:
+        if not _HTTP_SLOTS.acquire(timeout=HTTP_POOL_TIMEOUT):
+            raise requests.ConnectionError(f"No free connection after {HTTP_POOL_TIMEOUT}s waiting for {url}")
+        try:
+            # Not streamed, so the body is read and the connection released by now
+            response = get_session().request(method, url, **kwargs)
+        finally:
+            _HTTP_SLOTS.release()
+        reset_at = rate_limit_reset(response)
+        if reset_at is None:
+            return response
+        print(f"GitHub rate limit exceeded until {datetime.fromtimestamp(reset_at):%H:%M:%S}; "
+              "waiting for reset...", file=sys.stderr)
+        time.sleep(max(1.0, reset_at - time.time()))
+
+
+def get_auth_headers(token: str | None = None) -> Dict[str, str]:
+    """Per-request Authorization header; the session already sends Accept."""
+    return {"Authorization": f"Bearer {token}"} if token else {}
+
+
+@functools.lru_cache(maxsize=8192)
 def parse_github_datetime(date_str: str) -> datetime:
-    """Parse GitHub's ISO 8601 datetime string."""
+    """Parse GitHub's ISO 8601 datetime string.
+    
+    Memoized, since the same timestamps recur across an issue and its events.
+    """
     if not date_str:
         return None
     # GitHub uses UTC timezone in their API
     dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
     # Convert to PST/PDT
-    pst = get_pst_timezone()
-    return dt.astimezone(pst)
+    return dt.astimezone(PST)
 
 
-def is_business_day(dt: datetime) -> bool:
-    """Check if datetime falls on a business day (Mon-Fri)."""
-    return dt.weekday() < 5  # Monday = 0, Friday = 4
+def calendar_days_between(start_dt: datetime, end_dt: datetime) -> int:
+    """Whole days elapsed between two datetimes.
+    
+    Compared in UTC: datetimes sharing a ZoneInfo subtract as wall-clock times,
+    which would be off by the DST change for ranges spanning one.
+    """
+    return (end_dt.astimezone(timezone.utc) - start_dt.astimezone(timezone.utc)).days
 
 
-def get_business_hours_in_day(dt: datetime) -> tuple[datetime, datetime]:
-    """Get business hours (7am-7pm) for a given day, or extended if work detected."""
-    start = dt.replace(hour=7, minute=0, second=0, microsecond=0)
-    end = dt.replace(hour=19, minute=0, second=0, microsecond=0)  # 7pm
-    
-    # If the actual time is after 7pm, extend to midnight
-    if dt.hour >= 19:
-        end = dt.replace(hour=23, minute=59, second=59, microsecond=999999)
-    
-    return start, end
+def _to_microseconds(dt: datetime) -> tuple[int, int]:
+    """UTC epoch microseconds and UTC offset in microseconds of an aware datetime."""
+    return (dt - _EPOCH) // _MICROSECOND, dt.utcoffset() // _MICROSECOND
 
 
-def calculate_business_hours(start_dt: datetime, end_dt: datetime) -> float:
-    """Calculate business hours between two datetimes.
+def _business_hours_from_us(start_utc: np.ndarray, start_offset: np.ndarray,
+                            end_utc: np.ndarray, end_offset: np.ndarray) -> np.ndarray:
+    """Business hours between pairs of instants, vectorized over int64 arrays.
+    
+    Each instant is given as UTC epoch microseconds and a UTC offset in
+    microseconds (as from ``_to_microseconds``).
     
     Rules:
     - Business hours: 7am-7pm PST Mon-Fri
     - If work detected after 7pm, count until midnight
     - Skip weekends unless activity detected
+    
+    Instead of walking every calendar day, only the first and last day of each
+    range are clipped to its own times; business days in between count a flat
+    12 hours each via ``np.busday_count``. Days are taken in the start time's
+    UTC offset, the end day in the end time's own offset.
+    """
+    # Order each pair by instant (not wall-clock time, which is ambiguous around DST)
+    swapped = start_utc > end_utc
+    start_utc, end_utc = np.where(swapped, end_utc, start_utc), np.where(swapped, start_utc, end_utc)
+    start_offset, end_offset = np.where(swapped, end_offset, start_offset), np.where(swapped, start_offset, end_offset)
+    
+    # Local times of the range in the start's offset, and the local first/last days
+    start = start_utc + start_offset
+    end = end_utc + start_offset
+    first_day = start // _DAY_US
+    last_day = (end_utc + end_offset) // _DAY_US
+    first_midnight = first_day * _DAY_US
+    last_midnight = last_day * _DAY_US
+    single_day = last_day == first_day
+    
+    # If the actual start time is after 7pm, its day extends to midnight
+    first_biz_start = first_midnight + BUSINESS_DAY_START_HOUR * _HOUR_US
+    first_biz_end = np.where(
+        start - first_midnight >= BUSINESS_DAY_END_HOUR * _HOUR_US,
+        first_midnight + _DAY_US - 1,
+        first_midnight + BUSINESS_DAY_END_HOUR * _HOUR_US
+    )
+    last_biz_start = last_midnight + BUSINESS_DAY_START_HOUR * _HOUR_US
+    last_biz_end = last_midnight + BUSINESS_DAY_END_HOUR * _HOUR_US
+    
+    # Epoch day 0 (1970-01-01) was a Thursday; Monday = 0, Friday = 4
+    first_is_weekday = (first_day + 3) % 7 < 5
+    last_is_weekday = (last_day + 3) % 7 < 5
+    
+    day_start = np.maximum(start, first_biz_start)
+    first_hours = np.where(
+        first_is_weekday,
+        np.maximum(np.where(single_day, np.minimum(end, first_biz_end), first_biz_end) - day_start, 0) / 1e6 / 3600,
+        WEEKEND_ACTIVITY_HOURS
+    )
+    last_hours = np.where(
+        last_is_weekday,
+        np.maximum(np.minimum(end, last_biz_end) - last_biz_start, 0) / 1e6 / 3600,
+        WEEKEND_ACTIVITY_HOURS
+    )
+    # Business days strictly between the first and last day
+    middle_days = np.busday_count(
+        (first_day + 1).astype("datetime64[D]"),
+        np.maximum(last_day, first_day + 1).astype("datetime64[D]")
+    )
+    middle_hours = middle_days * float(BUSINESS_DAY_END_HOUR - BUSINESS_DAY_START_HOUR)
+    
+    total_hours = np.where(single_day, first_hours, first_hours + middle_hours + last_hours)
+    # An end day before the start day (across a UTC offset change) spans no days
+    return np.where(last_day >= first_day, total_hours, 0.0)
+
+
+def calculate_business_hours_array(start_dts: Sequence[datetime | None],
+                                   end_dts: Sequence[datetime | None]) -> np.ndarray:
+    """Calculate business hours between pairs of datetimes, vectorized over all pairs.
+    
+    See ``_business_hours_from_us`` for the rules. Pairs with a missing datetime
+    count 0 hours.
+    """
+    count = len(start_dts)
+    start_utc = np.zeros(count, dtype=np.int64)
+    end_utc = np.zeros(count, dtype=np.int64)
+    start_offset = np.zeros(count, dtype=np.int64)
+    end_offset = np.zeros(count, dtype=np.int64)
+    valid = np.zeros(count, dtype=bool)
+    for i, (start_dt, end_dt) in enumerate(zip(start_dts, end_dts)):
+        if not start_dt or not end_dt:
+            continue
+        start_utc[i], start_offset[i] = _to_microseconds(start_dt)
+        end_utc[i], end_offset[i] = _to_microseconds(end_dt)
+        valid[i] = True
+    
+    return np.where(valid, _business_hours_from_us(start_utc, start_offset, end_utc, end_offset), 0.0)
+
+
+@functools.lru_cache(maxsize=8192)
+def _business_hours_us(start_utc: int, start_offset: int, end_utc: int, end_offset: int) -> float:
+    """Memoized single-pair ``_business_hours_from_us``, keyed by integers so equal instants never collide."""
+    return float(_business_hours_from_us(
+        *(np.array([value], dtype=np.int64) for value in (start_utc, start_offset, end_utc, end_offset))
+    )[0])
+
+
+def calculate_business_hours(start_dt: datetime, end_dt: datetime) -> float:
+    """Calculate business hours between two datetimes (see ``_business_hours_from_us``).
+    
+    A missing datetime counts 0 hours.
     """
     if not start_dt or not end_dt:
         return 0.0
+    return _business_hours_us(*_to_microseconds(start_dt), *_to_microseconds(end_dt))
+
+
+def _fetch_page(url: str, headers: Dict[str, str], page: int, per_page: int) -> requests.Response | None:
+    """GET one page of a REST list endpoint, or None if it is unavailable or forbidden."""
+    params = {"per_page": per_page, "page": page}
+    response = _request("GET", url, headers=headers, params=params, timeout=30)
+    if response.status_code in [403, 404]:
+        return None
+    response.raise_for_status()
+    return response
+
+
+def fetch_all_pages(url: str, headers: Dict[str, str], per_page: int = 100) -> List[Dict[str, Any]]:
+    """Fetch every page of a REST list endpoint, or an empty list if it is unavailable.
     
-    if start_dt > end_dt:
-        start_dt, end_dt = end_dt, start_dt
-    
-    total_hours = 0.0
-    current_dt = start_dt
-    
-    while current_dt.date() <= end_dt.date():
-        if is_business_day(current_dt):
-            biz_start, biz_end = get_business_hours_in_day(current_dt)
-            
-            # Determine the actual start and end times for this day
-            day_start = max(current_dt, biz_start) if current_dt.date() == start_dt.date() else biz_start
-            day_end = min(end_dt, biz_end) if current_dt.date() == end_dt.date() else biz_end
-            
-            # Calculate hours for this day
-            if day_start < day_end:
-                hours = (day_end - day_start).total_seconds() / 3600
-                total_hours += hours
-        else:
-            # Weekend - check if there's activity
-            # For now, if issue was opened or closed on weekend, count some hours
-            if current_dt.date() == start_dt.date() or current_dt.date() == end_dt.date():
-                # Count 4 hours for weekend work
-                total_hours += 4.0
-        
-        current_dt = (current_dt + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
-    
-    return total_hours
+    The first response's ``Link: rel="last"`` header gives the page count, so the
+    remaining pages are fetched concurrently instead of one after another.
+    """
+    response = _fetch_page(url, headers, 1, per_page)
+    if response is None:
+        return []
+    items = _json(response)
+    
+    last = response.links.get("last")
+    if not last:
+        return items
+    last_page = int(parse_qs(urlparse(last["url"]).query)["page"][0])
+    
+    with ThreadPoolExecutor(max_workers=min(MAX_PAGE_WORKERS, max(1, last_page - 1))) as executor:
+        pages = list(executor.map(lambda page: _fetch_page(url, headers, page, per_page), range(2, last_page + 1)))
+    if any(page is None for page in pages):
+        return []
+    for page in pages:
+        items.extend(_json(page))
+    return items
 
 
 def fetch_issue_timeline(repo: str, issue_number: int, token: str | None = None) -> List[Dict[str, Any]]:
     """Fetch timeline events for a specific issue."""
     owner, repo_name = repo.split('/')
     url = f"https://api.github.com/repos/{owner}/{repo_name}/issues/{issue_number}/timeline"
-    headers = {
-        "Accept": "application/vnd.github+json",
-        "X-GitHub-Api-Version": "2022-11-28"
-    }
-    if token:
-        headers["Authorization"] = f"Bearer {token}"
-    
-    events = []
-    page = 1
-    per_page = 100
+    headers = {"X-GitHub-Api-Version": "2022-11-28", **get_auth_headers(token)}
+    # Timeline API might not be available or forbidden, giving an empty list
+    return fetch_all_pages(url, headers, TIMELINE_PAGE_SIZE)
+
+
+def fetch_issue_events(repo: str, issue_number: int, token: str | None = None) -> List[Dict[str, Any]]:
+    """Fetch events for a specific issue."""
+    owner, repo_name = repo.split('/')
+    url = f"https://api.github.com/repos/{owner}/{repo_name}/issues/{issue_number}/events"
+    # Events API might not be available or forbidden, giving an empty list
+    return fetch_all_pages(url, get_auth_headers(token), TIMELINE_PAGE_SIZE)
+
+
+def post_graphql(query: str, variables: Dict[str, Any], token: str) -> Dict[str, Any] | None:
+    """POST a GraphQL query and return its data, or None if access is forbidden.
     
+    Queries rejected with RATE_LIMITED (sent with HTTP 200) are retried once the
+    limit resets; any other error that leaves no data raises ``GraphQLError``.
+    """
     while True:
-        params = {"per_page": per_page, "page": page}
-        response = requests.get(url, headers=headers, params=params, timeout=30)
+        response = _request(
+            "POST",
+            "https://api.github.com/graphql",
+            headers=get_auth_headers(token),
+            json={"query": query, "variables": variables},
+            timeout=30
+        )
         if response.status_code in [403, 404]:
-            # Timeline API might not be available or forbidden, return empty
-            return []
+            return None
         response.raise_for_status()
+        result = _json(response)
         
-        data = response.json()
-        if not data:
-            break
-        events.extend(data)
-        if len(data) < per_page:
-            break
-        page += 1
-    
-    return events
+        errors = result.get("errors") or []
+        # Partial errors (e.g. an issue number that doesn't exist) still return data
+        for error in errors:
+            print(f"GraphQL error: {error.get('message')}", file=sys.stderr)
+        data = result.get("data")
+        if data is not None or not errors:
+            return data or {}
+        
+        if not any(error.get("type") == "RATE_LIMITED" for error in errors):
+            raise GraphQLError("; ".join(str(error.get("message")) for error in errors))
+        reset_at = float(response.headers.get("X-RateLimit-Reset", time.time() + 60))
+        print("GraphQL rate limit exhausted; waiting for reset...", file=sys.stderr)
+        time.sleep(max(1.0, reset_at - time.time()))
 
 
-def fetch_issue_events(repo: str, issue_number: int, token: str | None = None) -> List[Dict[str, Any]]:
-    """Fetch events for a specific issue."""
+def parse_graphql_timeline(nodes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Convert GraphQL timeline items into the same shape as REST timeline events."""
+    return [
+        {
+            "event": GRAPHQL_EVENT_TYPES.get(node.get("__typename")),
+            "created_at": node.get("createdAt"),
+            # REST reports a comment's author as its actor
+            "actor": node.get("author") or node.get("actor") or {}
+        }
+        for node in nodes
+    ]
+
+
+def fetch_issue_graphql(repo: str, issue_number: int, token: str,
+                        cursor: str | None = None) -> List[Dict[str, Any]]:
+    """Fetch comments, assignments and labelings for an issue via GraphQL (requires a token).
+    
+    Items are returned in the same shape as REST timeline events, starting after
+    ``cursor`` when given.
+    """
     owner, repo_name = repo.split('/')
-    url = f"https://api.github.com/repos/{owner}/{repo_name}/issues/{issue_number}/events"
-    headers = {"Accept": "application/vnd.github+json"}
-    if token:
-        headers["Authorization"] = f"Bearer {token}"
+    variables = {"owner": owner, "repo": repo_name, "number": issue_number, "cursor": cursor}
     
     events = []
-    page = 1
-    per_page = 100
-    
     while True:
-        params = {"per_page": per_page, "page": page}
-        response = requests.get(url, headers=headers, params=params, timeout=30)
-        if response.status_code in [403, 404]:
-            # Events API might not be available or forbidden, return empty
-            return []
-        response.raise_for_status()
+        data = post_graphql(ISSUE_TIMELINE_QUERY, variables, token)
+        issue = ((data or {}).get("repository") or {}).get("issue")
+        if not issue:
+            # Issue not visible to this token
+            return events
+        timeline_items = issue["timelineItems"]
+        events.extend(parse_graphql_timeline(timeline_items["nodes"]))
         
-        data = response.json()
-        if not data:
-            break
-        events.extend(data)
-        if len(data) < per_page:
+        if not timeline_items["pageInfo"]["hasNextPage"]:
             break
-        page += 1
+        variables["cursor"] = timeline_items["pageInfo"]["endCursor"]
     
     return events
 
 
-def analyze_issue_timing(issue: Dict[str, Any], repo: str, token: str | None = None) -> Dict[str, Any]:
-    """Analyze timing information for an issue."""
+def wait_for_graphql_rate_limit(rate_limit: Dict[str, Any] | None) -> None:
+    """Sleep until the rate limit resets once few GraphQL points remain."""
+    if not rate_limit or rate_limit["remaining"] >= GRAPHQL_RATE_LIMIT_LOW_WATERMARK:
+        return
+    reset_at = datetime.fromisoformat(rate_limit["resetAt"].replace('Z', '+00:00'))
+    delay = (reset_at - datetime.now(timezone.utc)).total_seconds()
+    if delay > 0:
+        print(f"GraphQL rate limit nearly exhausted, waiting {delay:.0f}s for reset...", file=sys.stderr)
+        time.sleep(delay)
+
+
+def fetch_issue_batch_graphql(repo: str, issue_numbers: List[int],
+                              token: str) -> Dict[int, List[Dict[str, Any]]]:
+    """Fetch timeline items for up to GRAPHQL_ISSUE_BATCH_SIZE issues in one request."""
+    owner, repo_name = repo.split('/')
+    aliases = "\n".join(
+        f"i{i}: issue(number: {number}) {{ ...timelineFields }}" for i, number in enumerate(issue_numbers)
+    )
+    query = f"""
+query($owner: String!, $repo: String!) {{
+  rateLimit {{ remaining resetAt }}
+  repository(owner: $owner, name: $repo) {{
+    {aliases}
+  }}
+}}
+{ISSUE_TIMELINE_FRAGMENT}
+"""
+    data = post_graphql(query, {"owner": owner, "repo": repo_name}, token)
+    if data is None:
+        return {number: [] for number in issue_numbers}
+    
+    repository = data.get("repository") or {}
+    events_by_issue = {}
+    for i, number in enumerate(issue_numbers):
+        issue = repository.get(f"i{i}")
+        if not issue:
+            # Issue not visible to this token
+            events_by_issue[number] = []
+            continue
+        timeline_items = issue["timelineItems"]
+        events = parse_graphql_timeline(timeline_items["nodes"])
+        # Only issues with more than one page of items need further requests
+        if timeline_items["pageInfo"]["hasNextPage"]:
+            events.extend(fetch_issue_graphql(repo, number, token, timeline_items["pageInfo"]["endCursor"]))
+        events_by_issue[number] = events
+    
+    wait_for_graphql_rate_limit(data.get("rateLimit"))
+    return events_by_issue
+
+
+def fetch_issues_graphql(repo: str, issue_numbers: List[int], token: str,
+                         workers: int = DEFAULT_WORKERS) -> Dict[int, List[Dict[str, Any]]]:
+    """Fetch timeline items for many issues, GRAPHQL_ISSUE_BATCH_SIZE per request.
+    
+    Returns the REST-shaped events of each issue keyed by issue number.
+    """
+    batches = [
+        issue_numbers[i:i + GRAPHQL_ISSUE_BATCH_SIZE]
+        for i in range(0, len(issue_numbers), GRAPHQL_ISSUE_BATCH_SIZE)
+    ]
+    events_by_issue: Dict[int, List[Dict[str, Any]]] = {}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        for batch_events in executor.map(lambda batch: fetch_issue_batch_graphql(repo, batch, token), batches):
+            events_by_issue.update(batch_events)
+    return events_by_issue
+
+
+def has_timeline_signal(issue: Dict[str, Any]) -> bool:
+    """Whether an issue's timeline could hold a first response, assignment or labeling.
+    
+    Judged from the search result: issues with no assignee, labels or comments
+    have nothing to find, so their timeline isn't fetched.
+    """
+    return bool(issue.get('assignee') or issue.get('labels') or issue.get('comments', 0))
+
+
+def _simple_analysis(issue: Dict[str, Any], business_hours: float | None = None,
+                     timing: Dict[str, Any] | None = None) -> Dict[str, Any]:
+    """Timing fields available from the search result alone, plus any extra ``timing`` fields."""
     created_at = parse_github_datetime(issue.get('created_at'))
     closed_at = parse_github_datetime(issue.get('closed_at'))
+    if business_hours is None:
+        business_hours = calculate_business_hours(created_at, closed_at)
+    calendar_days = calendar_days_between(created_at, closed_at) if created_at and closed_at else 0
     
-    # Fetch timeline events for more detailed analysis
-    timeline = fetch_issue_timeline(repo, issue['number'], token)
-    events = fetch_issue_events(repo, issue['number'], token) if not timeline else []
+    return {
+        'number': issue['number'],
+        'title': issue['title'],
+        'created_at': created_at.isoformat() if created_at else None,
+        'closed_at': closed_at.isoformat() if closed_at else None,
+        'assignee': issue.get('assignee', {}).get('login') if issue.get('assignee') else None,
+        'labels': [label['name'] for label in issue.get('labels', [])],
+        'business_hours': round(business_hours, 2),
+        'calendar_days': calendar_days,
+        **(timing or {}),
+        'url': issue['html_url']
+    }
+
+
+def analyze_issue_timing(issue: Dict[str, Any], repo: str, token: str | None = None,
+                         events: List[Dict[str, Any]] | None = None,
+                         business_hours: float | None = None) -> Dict[str, Any]:
+    """Analyze timing information for an issue.
+    
+    ``events`` are the issue's timeline events and ``business_hours`` its
+    resolution time when already computed in bulk (see ``fetch_issues_graphql``
+    and ``calculate_business_hours_array``); otherwise they are computed here.
+    """
+    if not has_timeline_signal(issue):
+        return _simple_analysis(issue, business_hours, {
+            'time_to_first_response_hours': None,
+            'time_to_assignment_hours': None
+        })
     
-    # Calculate business hours
-    business_hours = calculate_business_hours(created_at, closed_at)
+    created_at = parse_github_datetime(issue.get('created_at'))
     
-    # Calculate calendar days
-    calendar_days = (closed_at - created_at).days if created_at and closed_at else 0
+    # Fetch timeline events for more detailed analysis
+    if events is not None:
+        all_events = events
+    elif token:
+        # A single GraphQL request covers both REST endpoints
+        all_events = fetch_issue_graphql(repo, issue['number'], token)
+    else:
+        # The events API only adds anything when the timeline is unavailable
+        all_events = fetch_issue_timeline(repo, issue['number'], token)
+        if not all_events:
+            all_events = fetch_issue_events(repo, issue['number'], token)
     
     # Find key events
     first_response = None
     assigned_at = None
     labeled_at = None
     
-    all_events = timeline + events
-    for event in all_events:
+    author_login = issue.get('user', {}).get('login')
+    
+    # Walk events oldest first and stop once all three have been found
+    for event in sorted(all_events, key=lambda e: e.get('created_at') or ''):
         event_type = event.get('event', event.get('type'))
-        event_time = parse_github_datetime(event.get('created_at'))
         
         if event_type in ['commented', 'comment'] and not first_response:
             # Skip if it's the issue author commenting
-            if event.get('actor', {}).get('login') != issue.get('user', {}).get('login'):
-                first_response = event_time
+            if event.get('actor', {}).get('login') != author_login:
+                first_response = parse_github_datetime(event.get('created_at'))
         
-        if event_type == 'assigned' and not assigned_at:
-            assigned_at = event_time
+        elif event_type == 'assigned' and not assigned_at:
+            assigned_at = parse_github_datetime(event.get('created_at'))
         
-        if event_type == 'labeled' and not labeled_at:
-            labeled_at = event_time
+        elif event_type == 'labeled' and not labeled_at:
+            labeled_at = parse_github_datetime(event.get('created_at'))
+        
+        if first_response and assigned_at and labeled_at:
+            break
     
     # Calculate time to first response
     time_to_first_response = None
@@ -203,47 +681,131 @@ def analyze_issue_timing(issue: Dict[str, Any], repo: str, token: str | None = N
     if assigned_at:
         time_to_assignment = calculate_business_hours(created_at, assigned_at)
     
-    return {
-        'number': issue['number'],
-        'title': issue['title'],
-        'created_at': created_at.isoformat() if created_at else None,
-        'closed_at': closed_at.isoformat() if closed_at else None,
-        'assignee': issue.get('assignee', {}).get('login') if issue.get('assignee') else None,
-        'labels': [label['name'] for label in issue.get('labels', [])],
-        'business_hours': round(business_hours, 2),
-        'calendar_days': calendar_days,
+    return _simple_analysis(issue, business_hours, {
         'time_to_first_response_hours': round(time_to_first_response, 2) if time_to_first_response else None,
-        'time_to_assignment_hours': round(time_to_assignment, 2) if time_to_assignment else None,
-        'url': issue['html_url']
-    }
+        'time_to_assignment_hours': round(time_to_assignment, 2) if time_to_assignment else None
+    })
+
+
+def split_date_range(start_date: str, end_date: str) -> tuple[tuple[str, str], tuple[str, str]] | None:
+    """Split an inclusive YYYY-MM-DD range into two halves, or None for a single day."""
+    start, end = date.fromisoformat(start_date), date.fromisoformat(end_date)
+    if start >= end:
+        return None
+    middle = start + (end - start) // 2
+    return (start_date, middle.isoformat()), ((middle + timedelta(days=1)).isoformat(), end_date)
 
 
 def fetch_closed_issues(repo: str, start_date: str, end_date: str, token: str | None = None) -> List[Dict[str, Any]]:
-    """Return closed issues for repo between start_date and end_date."""
+    """Return closed issues for repo between start_date and end_date.
+    
+    Ranges matching more than SEARCH_RESULT_LIMIT issues are bisected by date,
+    since search stops returning results past that.
+    """
     url = "https://api.github.com/search/issues"
     query = f"repo:{repo} is:issue state:closed closed:{start_date}..{end_date}"
-    headers = {"Accept": "application/vnd.github+json"}
-    if token:
-        headers["Authorization"] = f"Bearer {token}"
+    headers = get_auth_headers(token)
     
-    issues: List[Dict[str, Any]] = []
+    issues: Dict[int, Dict[str, Any]] = {}
     page = 1
     per_page = 100
     
     while True:
         params = {"q": query, "per_page": per_page, "page": page}
-        response = requests.get(url, headers=headers, params=params, timeout=30)
+        response = _request("GET", url, headers=headers, params=params, timeout=30)
         response.raise_for_status()
-        data = response.json()
+        data = _json(response)
+        
+        if page == 1 and data.get("total_count", 0) > SEARCH_RESULT_LIMIT:
+            halves = split_date_range(start_date, end_date)
+            if halves:
+                # Union of both halves, deduplicated by issue number
+                for half_start, half_end in halves:
+                    for issue in fetch_closed_issues(repo, half_start, half_end, token):
+                        issues[issue["number"]] = issue
+                return list(issues.values())
+            print(f"Warning: {data['total_count']} issues closed on {start_date}; "
+                  f"only the first {SEARCH_RESULT_LIMIT} are returned", file=sys.stderr)
+        
         items = data.get("items", [])
-        issues.extend(items)
-        if len(items) < per_page:
+        for issue in items:
+            issues[issue["number"]] = issue
+        # Pages past the result limit are rejected rather than empty
+        if len(items) < per_page or page * per_page >= SEARCH_RESULT_LIMIT:
             break
         page += 1
     
+    return list(issues.values())
+
+
+def parse_graphql_issue(node: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a GraphQL search node into the same shape as a REST search result."""
+    assignees = node["assignees"]["nodes"]
+    return {
+        'number': node['number'],
+        'title': node['title'],
+        'html_url': node['url'],
+        'created_at': node['createdAt'],
+        'closed_at': node['closedAt'],
+        'user': node.get('author') or {},
+        'assignee': assignees[0] if assignees else None,
+        'labels': node['labels']['nodes'],
+        'comments': node['comments']['totalCount'],
+    }
+
+
+def search_closed_issues_graphql(repo: str, start_date: str, end_date: str, token: str) -> List[Dict[str, Any]]:
+    """Return closed issues for repo between start_date and end_date via GraphQL search.
+    
+    Pages are followed by cursor. Ranges matching more than SEARCH_RESULT_LIMIT
+    issues are bisected by date, since search stops returning results past that.
+    """
+    query = f"repo:{repo} is:issue is:closed closed:{start_date}..{end_date}"
+    variables = {"query": query, "cursor": None}
+    
+    issues: List[Dict[str, Any]] = []
+    while True:
+        data = post_graphql(CLOSED_ISSUES_SEARCH_QUERY, variables, token)
+        if data is None:
+            raise requests.HTTPError(f"GraphQL search forbidden for {repo}")
+        search = data.get("search")
+        if not search:
+            raise GraphQLError(f"GraphQL search returned no results for {repo}")
+        
+        if variables["cursor"] is None and search["issueCount"] > SEARCH_RESULT_LIMIT:
+            halves = split_date_range(start_date, end_date)
+            if halves:
+                return [
+                    issue
+                    for half_start, half_end in halves
+                    for issue in search_closed_issues_graphql(repo, half_start, half_end, token)
+                ]
+            print(f"Warning: {search['issueCount']} issues closed on {start_date}; "
+                  f"only the first {SEARCH_RESULT_LIMIT} are returned", file=sys.stderr)
+        
+        # Nodes that aren't issues (e.g. pull requests) come back empty
+        issues.extend(parse_graphql_issue(node) for node in search["nodes"] if node)
+        if not search["pageInfo"]["hasNextPage"]:
+            break
+        variables["cursor"] = search["pageInfo"]["endCursor"]
+    
     return issues
 
 
+def top_indices(values: np.ndarray, count: int) -> np.ndarray:
+    """Indices of the ``count`` largest values, largest first and ties in input order.
+    
+    Partitions in O(N) rather than sorting everything; only values tied with or
+    above the cut-off are sorted.
+    """
+    count = min(count, len(values))
+    if count == 0:
+        return np.empty(0, dtype=np.intp)
+    cutoff = np.partition(values, len(values) - count)[len(values) - count]
+    candidates = np.flatnonzero(values >= cutoff)
+    return candidates[np.lexsort((candidates, -values[candidates]))][:count]
+
+
 def main(argv: List[str] | None = None) -> int:
     parser = argparse.ArgumentParser(
         description="Fetch closed GitHub issues with time estimation between two dates."
@@ -255,48 +817,80 @@ def main(argv: List[str] | None = None) -> int:
     parser.add_argument("--csv", help="Optional CSV output file for analysis")
     parser.add_argument("--detailed", action="store_true", 
                        help="Fetch detailed timeline data (slower but more accurate)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                       help=f"Number of issues to analyze concurrently (default: {DEFAULT_WORKERS})")
+    
+    parser.add_argument("--cache", default=os.environ.get("GITHUB_CACHE_FILE"),
+                       help=f"SQLite file to cache API responses in (default: $GITHUB_CACHE_FILE, "
+                            f"else {HTTP_CACHE_FILE} next to --out)")
     
     args = parser.parse_args(argv)
+    get_session(args.cache or os.path.join(os.path.dirname(args.out or ""), HTTP_CACHE_FILE))
     
     token = os.environ.get("GITHUB_TOKEN")
     if not token:
         print("Warning: GITHUB_TOKEN not set. API rate limits will apply.", file=sys.stderr)
     
     print(f"Fetching closed issues from {args.repo} between {args.start} and {args.end}...", file=sys.stderr)
-    issues = fetch_closed_issues(args.repo, args.start, args.end, token)
+    if token:
+        issues = search_closed_issues_graphql(args.repo, args.start, args.end, token)
+    else:
+        # GraphQL API is only available to authenticated requests
+        issues = fetch_closed_issues(args.repo, args.start, args.end, token)
     print(f"Found {len(issues)} closed issues. Analyzing timing...", file=sys.stderr)
     
-    # Analyze timing for each issue
-    analyzed_issues = []
-    for i, issue in enumerate(issues):
-        print(f"Analyzing issue #{issue['number']} ({i+1}/{len(issues)})...", file=sys.stderr)
+    # With a token, timeline data for every issue is fetched up front in batched GraphQL queries
+    timeline_events: Dict[int, List[Dict[str, Any]]] = {}
+    if args.detailed and token:
+        print("Fetching timeline data via GraphQL...", file=sys.stderr)
+        timeline_events = fetch_issues_graphql(
+            args.repo, [issue['number'] for issue in issues if has_timeline_signal(issue)], token, args.workers
+        )
+    
+    # Analyze timing for each issue; the work is network-bound, so threads overlap the requests
+    progress_lock = threading.Lock()
+    analyzed_count = 0
+    
+    # Resolution times of all issues in one vectorized pass. Bot-created and
+    # auto-closed issues often share timestamps, so each distinct pair is only
+    # converted and computed once, then scattered back to its issues.
+    pair_index: Dict[tuple[str | None, str | None], int] = {}
+    pair_of_issue = np.fromiter(
+        (pair_index.setdefault((issue.get('created_at'), issue.get('closed_at')), len(pair_index))
+         for issue in issues),
+        dtype=np.intp, count=len(issues)
+    )
+    pair_hours = calculate_business_hours_array(
+        [parse_github_datetime(created_at) for created_at, _ in pair_index],
+        [parse_github_datetime(closed_at) for _, closed_at in pair_index]
+    )
+    resolution_hours = pair_hours[pair_of_issue].tolist()
+    
+    def analyze(issue: Dict[str, Any], business_hours: float) -> Dict[str, Any]:
+        nonlocal analyzed_count
+        with progress_lock:
+            analyzed_count += 1
+            print(f"Analyzing issue #{issue['number']} ({analyzed_count}/{len(issues)})...", file=sys.stderr)
+        
         if args.detailed:
-            analysis = analyze_issue_timing(issue, args.repo, token)
+            analysis = analyze_issue_timing(issue, args.repo, token, timeline_events.get(issue['number']),
+                                            business_hours)
         else:
             # Simple analysis without fetching timeline
-            created_at = parse_github_datetime(issue.get('created_at'))
-            closed_at = parse_github_datetime(issue.get('closed_at'))
-            business_hours = calculate_business_hours(created_at, closed_at)
-            calendar_days = (closed_at - created_at).days if created_at and closed_at else 0
-            
-            analysis = {
-                'number': issue['number'],
-                'title': issue['title'],
-                'created_at': created_at.isoformat() if created_at else None,
-                'closed_at': closed_at.isoformat() if closed_at else None,
-                'assignee': issue.get('assignee', {}).get('login') if issue.get('assignee') else None,
-                'labels': [label['name'] for label in issue.get('labels', [])],
-                'business_hours': round(business_hours, 2),
-                'calendar_days': calendar_days,
-                'url': issue['html_url']
-            }
-        analyzed_issues.append(analysis)
-    
-    # Calculate summary statistics
-    total_hours = sum(i['business_hours'] for i in analyzed_issues)
-    avg_hours = total_hours / len(analyzed_issues) if analyzed_issues else 0
-    max_hours = max((i['business_hours'] for i in analyzed_issues), default=0)
-    min_hours = min((i['business_hours'] for i in analyzed_issues), default=0)
+            analysis = _simple_analysis(issue, business_hours)
+        return analysis
+    
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as executor:
+        analyzed_issues = list(executor.map(analyze, issues, resolution_hours))
+    
+    # Calculate summary statistics over a contiguous array of business hours
+    hours = np.fromiter((i['business_hours'] for i in analyzed_issues), dtype=np.float64, count=len(analyzed_issues))
+    if analyzed_issues:
+        total_hours, avg_hours, max_hours, min_hours = (
+            float(hours.sum()), float(hours.mean()), float(hours.max()), float(hours.min())
+        )
+    else:
+        total_hours = avg_hours = max_hours = min_hours = 0
     
     summary = {
         'total_issues': len(analyzed_issues),
@@ -309,8 +903,8 @@ def main(argv: List[str] | None = None) -> int:
     
     # Output results
     if args.out:
-        with open(args.out, "w", encoding="utf-8") as fh:
-            json.dump(summary, fh, indent=2)
+        with open(args.out, "wb") as fh:
+            fh.write(orjson.dumps(summary, option=orjson.OPT_INDENT_2))
         print(f"Results written to {args.out}", file=sys.stderr)
     
     if args.csv:
@@ -322,14 +916,17 @@ def main(argv: List[str] | None = None) -> int:
                 if args.detailed:
                     fieldnames.extend(['time_to_first_response_hours', 'time_to_assignment_hours'])
                 
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
-                for issue in analyzed_issues:
-                    row = {k: issue.get(k, '') for k in fieldnames}
-                    # Convert labels list to string
-                    if 'labels' in row:
-                        row['labels'] = ', '.join(row['labels']) if row['labels'] else ''
-                    writer.writerow(row)
+                def iter_rows():
+                    for issue in analyzed_issues:
+                        # Convert labels list to string
+                        yield tuple(
+                            ', '.join(issue['labels']) if k == 'labels' else issue.get(k, '')
+                            for k in fieldnames
+                        )
+                
+                writer = csv.writer(csvfile)
+                writer.writerow(fieldnames)
+                writer.writerows(iter_rows())
         print(f"CSV results written to {args.csv}", file=sys.stderr)
     
     # Print summary to stdout
@@ -342,8 +939,8 @@ def main(argv: List[str] | None = None) -> int:
     
     if not args.out:
         print("\n=== Top 10 Issues by Time ===")
-        sorted_issues = sorted(analyzed_issues, key=lambda x: x['business_hours'], reverse=True)[:10]
-        for issue in sorted_issues:
+        for index in top_indices(hours, 10):
+            issue = analyzed_issues[index]
             print(f"#{issue['number']}: {issue['business_hours']} hours - {issue['title'][:60]}...")
     
     return 0
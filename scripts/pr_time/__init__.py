@@ -0,0 +1,8 @@
+"""
+PR time estimation package shared by estimate_pr_time.py and estimate_pr_time_fallback.py.
+"""
+
+from .pipeline import process
+from .strategies import ApiStrategy, MetadataStrategy, TimeEstimator
+
+__all__ = ["process", "ApiStrategy", "MetadataStrategy", "TimeEstimator"]
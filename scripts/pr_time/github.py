@@ -0,0 +1,539 @@
+"""
+GitHub API client used by the commit-based time estimator.
+
+Fetches PR bodies and commits concurrently with aiohttp, either as two REST
+calls per PR or batched through GraphQL when a token is available. Responses
+are cached on disk and requests are paced by the X-RateLimit-* headers.
+"""
+
+import asyncio
+import contextlib
+import itertools
+import json
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import AsyncIterator, Dict, Iterable, List, NamedTuple, Optional, Tuple
+import aiohttp
+from tqdm import tqdm
+
+# GitHub API configuration
+GITHUB_API_BASE = "https://api.github.com"
+GITHUB_TOKEN = os.environ.get("GITHUB_TOKEN")
+# Optional comma-separated tokens to rotate between - each has its own rate limit
+GITHUB_TOKENS = [
+    token.strip() for token in os.environ.get("GITHUB_TOKENS", "").split(",") if token.strip()
+] or ([GITHUB_TOKEN] if GITHUB_TOKEN else [])
+
+# Concurrency configuration - be nice to GitHub API (secondary rate limits)
+MAX_CONCURRENT_PRS = 10  # PRs fetched in parallel
+MAX_CONNECTIONS = 10  # Open sockets to api.github.com
+FETCH_CHUNK_SIZE = 500  # PRs fetched before their results are handed on and released
+REQUEST_TIMEOUT_SECONDS = 60  # Per request, including the wait for a free connection
+
+# Rate limit configuration - only slow down once a token's budget runs low
+RATE_LIMIT_LOW_WATERMARK = 50  # Below this many remaining requests, spread the rest until reset
+
+# REST pagination configuration
+REST_PAGE_SIZE = 100  # Largest per_page GitHub allows
+REST_MAX_PR_COMMITS = 250  # /pulls/{n}/commits never returns more than this
+
+# GraphQL configuration (requires a token)
+GRAPHQL_BATCH_SIZE = 50  # PRs aliased into a single query
+GRAPHQL_PAGE_SIZE = 100  # GraphQL connections return at most 100 nodes per page
+
+# On-disk response cache configuration
+CACHE_FILE = "/workspaces/github-utils/output/pr_cache.sqlite"
+CACHE_EXPIRE_SECONDS = 86400  # Revalidate unmerged PRs after a day; merged PRs never expire
+
+# Fields selected for a PR's commits; shared by the batch and pagination queries
+GRAPHQL_COMMIT_FIELDS = """
+pageInfo { hasNextPage endCursor }
+nodes { commit { oid authoredDate message author { name } } }
+"""
+
+GRAPHQL_PR_FRAGMENT = f"""
+fragment prFields on PullRequest {{
+  body
+  merged
+  commits(first: {GRAPHQL_PAGE_SIZE}) {{ {GRAPHQL_COMMIT_FIELDS} }}
+}}
+"""
+
+GRAPHQL_COMMITS_PAGE_QUERY = f"""
+query($owner: String!, $repo: String!, $number: Int!, $cursor: String) {{
+  repository(owner: $owner, name: $repo) {{
+    pullRequest(number: $number) {{
+      commits(first: {GRAPHQL_PAGE_SIZE}, after: $cursor) {{ {GRAPHQL_COMMIT_FIELDS} }}
+    }}
+  }}
+}}
+"""
+
+
+def get_github_headers():
+    """Get headers for GitHub API requests"""
+    headers = {
+        "Accept": "application/vnd.github.v3+json",
+        "User-Agent": "PR-Time-Estimator"
+    }
+    if GITHUB_TOKEN:
+        headers["Authorization"] = f"token {GITHUB_TOKEN}"
+    return headers
+
+
+class GitHubRateLimiter:
+    """
+    Reactive rate limiter driven by the X-RateLimit-* headers on each response.
+    Requests go out at full speed until a token's remaining budget drops below
+    RATE_LIMIT_LOW_WATERMARK, then the rest is spread evenly until the reset time.
+    Requests are rotated round-robin across all configured tokens.
+    """
+    
+    def __init__(self, tokens: List[str]):
+        self._tokens = itertools.cycle(tokens or [None])
+        # (token, resource) -> (remaining, reset epoch); REST and GraphQL have separate budgets
+        self.limits: Dict[Tuple[Optional[str], str], Tuple[int, float]] = {}
+    
+    def next_token(self) -> Optional[str]:
+        return next(self._tokens)
+    
+    async def wait(self, token: Optional[str], resource: str):
+        """Sleep if this token's budget for the resource is running low"""
+        key = (token, resource)
+        if key not in self.limits:
+            return
+        remaining, reset = self.limits[key]
+        # Count this request against the budget so concurrent callers spread out
+        self.limits[key] = (remaining - 1, reset)
+        if remaining < RATE_LIMIT_LOW_WATERMARK:
+            await asyncio.sleep(max(0.0, reset - time.time()) / max(remaining, 1))
+    
+    def update(self, token: Optional[str], headers):
+        """Record the budget reported by a response"""
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        if remaining is not None and reset is not None:
+            resource = headers.get("X-RateLimit-Resource", "core")
+            self.limits[(token, resource)] = (int(remaining), float(reset))
+
+
+class GitHubSession:
+    """aiohttp session wrapper that applies token rotation and rate limiting to every request"""
+    
+    def __init__(self, session: aiohttp.ClientSession, limiter: GitHubRateLimiter):
+        self.session = session
+        self.limiter = limiter
+    
+    def get(self, url: str, **kwargs):
+        return self.request("GET", url, **kwargs)
+    
+    def post(self, url: str, **kwargs):
+        return self.request("POST", url, **kwargs)
+    
+    @contextlib.asynccontextmanager
+    async def request(self, method: str, url: str, headers: Optional[Dict] = None, **kwargs):
+        token = self.limiter.next_token()
+        await self.limiter.wait(token, "graphql" if url.endswith("/graphql") else "core")
+        
+        headers = dict(headers or {})
+        if token:
+            headers["Authorization"] = f"token {token}"
+        
+        async with self.session.request(method, url, headers=headers, **kwargs) as response:
+            self.limiter.update(token, response.headers)
+            yield response
+
+
+class CachedResponse(NamedTuple):
+    etag: Optional[str]
+    payload: object
+    next_url: Optional[str]
+    is_fresh: bool
+
+
+class ResponseCache:
+    """
+    SQLite-backed cache of GitHub API responses keyed by URL (or another unique key).
+    Stores each response's ETag so expired entries can be revalidated with
+    If-None-Match - a 304 reply doesn't count against the rate limit.
+    Entries are grouped by PR so a merged PR's pages can all be marked immutable.
+    
+    SQLite calls block, so they run on a single worker thread rather than on the
+    event loop; the one thread also serializes all access to the connection.
+    """
+    
+    def __init__(self, path: str = CACHE_FILE):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pr-cache")
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses "
+            "(key TEXT PRIMARY KEY, pr_key TEXT, etag TEXT, payload TEXT NOT NULL, next_url TEXT, expires_at REAL)"
+        )
+        # PRs whose content can never change again (i.e. merged)
+        self.immutable_prs = set()
+    
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+    
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        """Return the cached response for a key, or None"""
+        return await self._run(self._get, key)
+    
+    async def put(self, key: str, pr_key: str, payload: object,
+                  etag: Optional[str] = None, next_url: Optional[str] = None):
+        """Store a payload; entries of immutable PRs are stored without an expiry"""
+        await self._run(self._put, key, pr_key, payload, etag, next_url)
+    
+    async def mark_immutable(self, pr_key: str):
+        """Never expire entries for this PR, including ones that haven't been stored yet"""
+        self.immutable_prs.add(pr_key)
+        await self._run(self._mark_immutable, pr_key)
+    
+    def _get(self, key: str) -> Optional[CachedResponse]:
+        row = self.conn.execute(
+            "SELECT etag, payload, next_url, expires_at FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        etag, payload, next_url, expires_at = row
+        is_fresh = expires_at is None or expires_at > time.time()
+        return CachedResponse(etag, json.loads(payload), next_url, is_fresh)
+    
+    def _put(self, key: str, pr_key: str, payload: object,
+             etag: Optional[str], next_url: Optional[str]):
+        expires_at = None if pr_key in self.immutable_prs else time.time() + CACHE_EXPIRE_SECONDS
+        self.conn.execute(
+            "INSERT OR REPLACE INTO responses (key, pr_key, etag, payload, next_url, expires_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (key, pr_key, etag, json.dumps(payload), next_url, expires_at)
+        )
+        self.conn.commit()
+    
+    def _mark_immutable(self, pr_key: str):
+        self.conn.execute("UPDATE responses SET expires_at = NULL WHERE pr_key = ?", (pr_key,))
+        self.conn.commit()
+    
+    def close(self):
+        self.executor.shutdown(wait=True)
+        self.conn.close()
+
+
+def pr_cache_key(owner: str, repo: str, pr_number: int) -> str:
+    """Key grouping all cached responses that belong to one PR"""
+    return f"{owner}/{repo}#{pr_number}"
+
+
+async def get_json_cached(session: GitHubSession, cache: ResponseCache, url: str,
+                          pr_key: str) -> Tuple[object, Optional[str]]:
+    """
+    GET a GitHub API URL, serving fresh entries from cache and revalidating stale ones by ETag.
+    Returns the JSON payload and the URL of the next page (from the Link header), if any.
+    """
+    cached = await cache.get(url)
+    if cached and cached.is_fresh:
+        return cached.payload, cached.next_url
+    
+    headers = {"If-None-Match": cached.etag} if cached and cached.etag else {}
+    async with session.get(url, headers=headers) as response:
+        if response.status == 304:
+            # Unchanged - refresh the expiry and reuse the cached payload
+            await cache.put(url, pr_key, cached.payload, cached.etag, cached.next_url)
+            return cached.payload, cached.next_url
+        response.raise_for_status()
+        payload = await response.json()
+        next_link = response.links.get("next")
+        next_url = str(next_link["url"]) if next_link else None
+    
+    await cache.put(url, pr_key, payload, response.headers.get("ETag"), next_url)
+    return payload, next_url
+
+
+def iso_to_epoch(timestamp: str) -> float:
+    """
+    Convert an ISO-8601 timestamp to epoch seconds.
+    REST author dates are UTC ("...Z"), but GraphQL's authoredDate keeps the
+    author's offset ("...-07:00"); both are honoured.
+    """
+    return datetime.fromisoformat(timestamp.replace("Z", "+00:00")).timestamp()
+
+
+async def fetch_pr_body(session: GitHubSession, cache: ResponseCache,
+                        owner: str, repo: str, pr_number: int) -> Optional[str]:
+    """Fetch PR body from GitHub API"""
+    url = f"{GITHUB_API_BASE}/repos/{owner}/{repo}/pulls/{pr_number}"
+    pr_key = pr_cache_key(owner, repo, pr_number)
+    
+    try:
+        data, _ = await get_json_cached(session, cache, url, pr_key)
+        if data.get("merged"):
+            # Merged PRs are immutable - never revalidate the PR or its commits
+            await cache.mark_immutable(pr_key)
+        return data.get("body", "")
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        tqdm.write(f"Error fetching PR #{pr_number}: {str(e) or 'request timed out'}")
+        return None
+
+
+async def fetch_pr_commits(session: GitHubSession, cache: ResponseCache,
+                           owner: str, repo: str, pr_number: int) -> List[Dict]:
+    """
+    Fetch commits for a PR from GitHub API, following Link: rel="next" pagination.
+    Note the REST endpoint returns at most REST_MAX_PR_COMMITS commits; the
+    GraphQL path (used when a token is set) has no such cap.
+    """
+    url = f"{GITHUB_API_BASE}/repos/{owner}/{repo}/pulls/{pr_number}/commits?per_page={REST_PAGE_SIZE}"
+    pr_key = pr_cache_key(owner, repo, pr_number)
+    
+    try:
+        commits = []
+        while url:
+            page, url = await get_json_cached(session, cache, url, pr_key)
+            commits.extend(page)
+        
+        if len(commits) >= REST_MAX_PR_COMMITS:
+            tqdm.write(f"Warning: PR #{pr_number} hit the {REST_MAX_PR_COMMITS}-commit REST API cap; "
+                       "set GITHUB_TOKEN to fetch all commits via GraphQL")
+        
+        # Extract timestamp and author info
+        commit_data = []
+        for commit in commits:
+            commit_data.append({
+                "sha": commit["sha"],
+                "ts": iso_to_epoch(commit["commit"]["author"]["date"]),
+                "author": commit["commit"]["author"]["name"],
+                "message": commit["commit"]["message"]
+            })
+        return commit_data
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        tqdm.write(f"Error fetching commits for PR #{pr_number}: {str(e) or 'request timed out'}")
+        return []
+
+
+async def fetch_pr(session: GitHubSession, sem: asyncio.BoundedSemaphore, cache: ResponseCache,
+                   owner: str, repo: str, pr_number: int) -> Tuple[Optional[str], List[Dict]]:
+    """Fetch body and commits for a single PR concurrently"""
+    async with sem:
+        body, commits = await asyncio.gather(
+            fetch_pr_body(session, cache, owner, repo, pr_number),
+            fetch_pr_commits(session, cache, owner, repo, pr_number)
+        )
+    return body, commits
+
+
+def parse_graphql_commits(nodes: List[Dict]) -> List[Dict]:
+    """Convert GraphQL commit nodes into the same shape as fetch_pr_commits"""
+    commit_data = []
+    for node in nodes:
+        commit = node["commit"]
+        commit_data.append({
+            "sha": commit["oid"],
+            "ts": iso_to_epoch(commit["authoredDate"]),
+            "author": (commit.get("author") or {}).get("name"),
+            "message": commit["message"]
+        })
+    return commit_data
+
+
+class GraphQLError(Exception):
+    """A GraphQL query failed outright, returning errors and no data"""
+
+
+async def post_graphql(session: GitHubSession, query: str, variables: Dict) -> Dict:
+    """
+    POST a query to the GitHub GraphQL API and return its data.
+    Queries rejected with RATE_LIMITED (sent with HTTP 200) are retried once the
+    limit resets; any other error that leaves no data raises GraphQLError.
+    """
+    while True:
+        async with session.post(f"{GITHUB_API_BASE}/graphql",
+                                json={"query": query, "variables": variables}) as response:
+            response.raise_for_status()
+            result = await response.json()
+            reset = response.headers.get("X-RateLimit-Reset")
+        
+        errors = result.get("errors") or []
+        # Partial errors (e.g. a PR number that doesn't exist) still return data
+        for error in errors:
+            tqdm.write(f"GraphQL error: {error.get('message')}")
+        data = result.get("data")
+        if data is not None or not errors:
+            return data or {}
+        
+        if not any(error.get("type") == "RATE_LIMITED" for error in errors):
+            raise GraphQLError("; ".join(str(error.get("message")) for error in errors))
+        delay = max(1.0, float(reset) - time.time()) if reset else 60.0
+        tqdm.write(f"GraphQL rate limit exhausted, waiting {delay:.0f}s for reset...")
+        await asyncio.sleep(delay)
+
+
+async def fetch_remaining_commits_graphql(session: GitHubSession, owner: str, repo: str,
+                                          pr_number: int, cursor: str) -> List[Dict]:
+    """Page through commit nodes for a PR whose first page was truncated"""
+    nodes = []
+    has_next_page = True
+    
+    while has_next_page:
+        data = await post_graphql(session, GRAPHQL_COMMITS_PAGE_QUERY, {
+            "owner": owner, "repo": repo, "number": pr_number, "cursor": cursor
+        })
+        pull_request = (data.get("repository") or {}).get("pullRequest")
+        if not pull_request:
+            break
+        commits = pull_request["commits"]
+        nodes.extend(commits["nodes"])
+        has_next_page = commits["pageInfo"]["hasNextPage"]
+        cursor = commits["pageInfo"]["endCursor"]
+    
+    return nodes
+
+
+def graphql_cache_key(owner: str, repo: str, pr_number: int) -> str:
+    """Cache key for a PR fetched via GraphQL (POST responses carry no ETag)"""
+    return f"graphql:{pr_cache_key(owner, repo, pr_number)}"
+
+
+async def fetch_pr_batch_graphql(session: GitHubSession, cache: ResponseCache, owner: str, repo: str,
+                                 numbers: List[int]) -> List[Tuple[Optional[str], List[Dict]]]:
+    """Fetch bodies and commits for up to GRAPHQL_BATCH_SIZE PRs in one request"""
+    aliases = "\n".join(
+        f"pr{i}: pullRequest(number: {number}) {{ ...prFields }}" for i, number in enumerate(numbers)
+    )
+    query = f"""
+query($owner: String!, $repo: String!) {{
+  repository(owner: $owner, name: $repo) {{
+    {aliases}
+  }}
+}}
+{GRAPHQL_PR_FRAGMENT}
+"""
+    
+    try:
+        data = await post_graphql(session, query, {"owner": owner, "repo": repo})
+        repository = data.get("repository") or {}
+        
+        results = []
+        for i, number in enumerate(numbers):
+            pull_request = repository.get(f"pr{i}")
+            if not pull_request:
+                tqdm.write(f"Error fetching PR #{number}: not returned by GraphQL")
+                results.append((None, []))
+                continue
+            
+            commits = pull_request["commits"]
+            nodes = commits["nodes"]
+            # Only PRs with more than one page of commits need further requests
+            if commits["pageInfo"]["hasNextPage"]:
+                nodes.extend(await fetch_remaining_commits_graphql(
+                    session, owner, repo, number, commits["pageInfo"]["endCursor"]
+                ))
+            
+            pr_key = pr_cache_key(owner, repo, number)
+            if pull_request.get("merged"):
+                await cache.mark_immutable(pr_key)
+            await cache.put(graphql_cache_key(owner, repo, number), pr_key,
+                            {"body": pull_request.get("body", ""), "commit_nodes": nodes})
+            
+            results.append((pull_request.get("body", ""), parse_graphql_commits(nodes)))
+        return results
+    except (aiohttp.ClientError, asyncio.TimeoutError, GraphQLError) as e:
+        tqdm.write(f"Error fetching PRs #{numbers[0]}-#{numbers[-1]} via GraphQL: {str(e) or 'request timed out'}")
+        return [(None, []) for _ in numbers]
+
+
+async def fetch_prs_graphql(session: GitHubSession, cache: ResponseCache, owner: str, repo: str,
+                            prs: Iterable[Dict]) -> List[Tuple[Dict, Optional[str], List[Dict]]]:
+    """
+    Fetch bodies and commits for all PRs via GraphQL.
+    Batches GRAPHQL_BATCH_SIZE PRs per request instead of two REST calls per PR,
+    and only requests PRs without a fresh cache entry. Each batch is dispatched
+    as soon as it fills, while the remaining PRs are still being read.
+    """
+    ordered_prs = []
+    results = {}
+    batch_tasks = []
+    batch = []
+    
+    for pr in prs:
+        ordered_prs.append(pr)
+        number = pr["pr_number"]
+        
+        cached = await cache.get(graphql_cache_key(owner, repo, number))
+        if cached and cached.is_fresh:
+            record = cached.payload
+            results[number] = (record["body"], parse_graphql_commits(record["commit_nodes"]))
+            continue
+        
+        batch.append(number)
+        if len(batch) == GRAPHQL_BATCH_SIZE:
+            batch_tasks.append((batch, asyncio.create_task(
+                fetch_pr_batch_graphql(session, cache, owner, repo, batch)
+            )))
+            batch = []
+            await asyncio.sleep(0)  # Let the request start before reading more PRs
+    
+    if batch:
+        batch_tasks.append((batch, asyncio.create_task(
+            fetch_pr_batch_graphql(session, cache, owner, repo, batch)
+        )))
+    
+    if results:
+        tqdm.write(f"Loaded {len(results)} PRs from cache")
+    
+    for numbers, task in batch_tasks:
+        results.update(zip(numbers, await task))
+    
+    return [(pr, *results[pr["pr_number"]]) for pr in ordered_prs]
+
+
+async def fetch_prs_rest(session: GitHubSession, sem: asyncio.BoundedSemaphore, cache: ResponseCache,
+                         owner: str, repo: str,
+                         prs: Iterable[Dict]) -> List[Tuple[Dict, Optional[str], List[Dict]]]:
+    """Fetch bodies and commits for PRs with two REST calls each, all PRs in flight at once"""
+    ordered_prs = []
+    tasks = []
+    for pr in prs:
+        ordered_prs.append(pr)
+        tasks.append(asyncio.create_task(
+            fetch_pr(session, sem, cache, owner, repo, pr["pr_number"])
+        ))
+        await asyncio.sleep(0)  # Let the request start before reading more PRs
+    
+    results = await asyncio.gather(*tasks)
+    return [(pr, body, commits) for pr, (body, commits) in zip(ordered_prs, results)]
+
+
+async def iter_pr_chunks(owner: str, repo: str,
+                         prs: Iterable[Dict]) -> AsyncIterator[List[Tuple[Dict, Optional[str], List[Dict]]]]:
+    """
+    Fetch bodies and commits for all PRs, yielding (pr, body, commits) tuples in input
+    order, FETCH_CHUNK_SIZE PRs at a time so only one chunk of results is held at once.
+    Uses batched GraphQL when authenticated, otherwise two REST calls per PR.
+    Throttling comes from the semaphore, the connector's socket limit and the rate limiter.
+    """
+    sem = asyncio.BoundedSemaphore(MAX_CONCURRENT_PRS)
+    connector = aiohttp.TCPConnector(limit=MAX_CONNECTIONS)
+    timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT_SECONDS)
+    cache = ResponseCache()
+    prs = iter(prs)
+    
+    try:
+        async with aiohttp.ClientSession(headers=get_github_headers(), connector=connector,
+                                         timeout=timeout) as client:
+            session = GitHubSession(client, GitHubRateLimiter(GITHUB_TOKENS))
+            
+            while True:
+                chunk = itertools.islice(prs, FETCH_CHUNK_SIZE)
+                # GraphQL API is only available to authenticated requests
+                if GITHUB_TOKENS:
+                    results = await fetch_prs_graphql(session, cache, owner, repo, chunk)
+                else:
+                    results = await fetch_prs_rest(session, sem, cache, owner, repo, chunk)
+                if not results:
+                    break
+                yield results
+    finally:
+        cache.close()
@@ -0,0 +1,144 @@
+"""
+Shared driver for the PR time estimators.
+
+Reads output/prs-to-date.json, streams its PRs through a TimeEstimator
+strategy and writes the enhanced data to output/prs-with-estimates.json.
+Enhanced PRs are appended to output/prs-with-estimates.jsonl as they are
+estimated and only copied into the final JSON at the end, so the full list
+of PRs is never held in memory.
+"""
+
+import asyncio
+import os
+import sys
+from datetime import date
+from typing import BinaryIO, Dict, Iterable, Tuple
+import ijson
+import orjson
+from tqdm.asyncio import tqdm
+
+from .strategies import TimeEstimator
+
+INPUT_FILE = "/workspaces/github-utils/output/prs-to-date.json"
+OUTPUT_FILE = "/workspaces/github-utils/output/prs-with-estimates.json"
+
+
+def load_input_metadata(f) -> Tuple[Dict, int]:
+    """
+    Read every top-level field of the input file except the pull_requests array,
+    which is only counted. The PRs themselves are streamed separately with ijson.items.
+    """
+    metadata = {}
+    key = builder = None
+    pr_count = 0
+    
+    for prefix, event, value in ijson.parse(f, use_float=True):
+        if prefix == "pull_requests.item":
+            # A PR's keys and closing event share its prefix; only its opening event counts
+            if event not in ("map_key", "end_map", "end_array"):
+                pr_count += 1
+        elif prefix == "":
+            if event in ("map_key", "end_map"):
+                # A top-level value just finished
+                if builder is not None:
+                    metadata[key] = builder.value
+                key = value
+                builder = ijson.ObjectBuilder() if key != "pull_requests" else None
+        elif builder is not None:
+            builder.event(event, value)
+    
+    return metadata, pr_count
+
+
+async def write_entries(strategy: TimeEstimator, data: Dict, prs: Iterable[Dict], pr_count: int,
+                        entries_fh: BinaryIO) -> Tuple[int, float, int, int]:
+    """
+    Merge each PR with its estimate fields and write it to the entries file as one
+    JSON line. Returns the PR count and hours, sessions and commits summed along the way.
+    """
+    total_prs = total_hours = total_sessions = total_commits = 0
+    async for pr, fields in tqdm(strategy.estimate(data, prs), desc="PRs", unit="PR", total=pr_count):
+        entries_fh.write(orjson.dumps({**pr, **fields}, default=str))
+        entries_fh.write(b"\n")
+        
+        estimate = fields["github_estimate"]
+        total_prs += 1
+        total_hours += estimate["estimated_hours"]
+        total_sessions += estimate["sessions"]
+        total_commits += estimate["commits"]
+    
+    return total_prs, total_hours, total_sessions, total_commits
+
+
+def write_output(output_file: str, output_data: Dict, entries_file: str):
+    """
+    Write output_data as indented JSON, streaming its pull_requests array from the
+    entries file one line at a time (output_data["pull_requests"] only fixes its position).
+    """
+    with open(output_file, 'wb') as out:
+        for i, (key, value) in enumerate(output_data.items()):
+            out.write(b",\n  " if i else b"{\n  ")
+            out.write(orjson.dumps(key) + b": ")
+            
+            if key != "pull_requests":
+                out.write(orjson.dumps(value, default=str, option=orjson.OPT_INDENT_2).replace(b"\n", b"\n  "))
+                continue
+            
+            out.write(b"[")
+            written = 0
+            with open(entries_file, 'rb') as entries_fh:
+                for line in entries_fh:
+                    pr = orjson.dumps(orjson.loads(line), option=orjson.OPT_INDENT_2)
+                    out.write(b",\n    " if written else b"\n    ")
+                    out.write(pr.replace(b"\n", b"\n    "))
+                    written += 1
+            out.write(b"\n  ]" if written else b"]")
+        out.write(b"\n}")
+
+
+def process(strategy: TimeEstimator, input_file: str = INPUT_FILE, output_file: str = OUTPUT_FILE):
+    """Process PR data with the given strategy and add estimates"""
+    
+    try:
+        input_fh = open(input_file, 'rb')
+    except FileNotFoundError:
+        print(f"Error: Could not find {input_file}")
+        sys.exit(1)
+    
+    with input_fh:
+        try:
+            data, pr_count = load_input_metadata(input_fh)
+        except ijson.JSONError as e:
+            print(f"Error parsing JSON: {e}")
+            sys.exit(1)
+        
+        strategy.print_intro(pr_count)
+        
+        # Stream PRs from the input file through the strategy and out to the entries file
+        input_fh.seek(0)
+        prs = ijson.items(input_fh, "pull_requests.item", use_float=True)
+        entries_file = os.path.splitext(output_file)[0] + ".jsonl"
+        with open(entries_file, 'wb') as entries_fh:
+            total_prs, total_hours, total_sessions, total_commits = asyncio.run(
+                write_entries(strategy, data, prs, pr_count, entries_fh)
+            )
+    
+    # Create enhanced output
+    output_data = {
+        "repository": data.get("repository"),
+        "target_branch": data.get("target_branch"),
+        "analysis_date": date.today().isoformat(),
+        "original_analysis_date": data.get("analysis_date"),
+        "total_prs": total_prs,
+        **strategy.header_fields(),
+        "summary": data.get("summary"),
+        **strategy.summary_fields(data, total_hours, total_sessions, total_commits, total_prs),
+        "pull_requests": [],  # Filled in from entries_file by write_output
+        "methodology": data.get("methodology"),
+        **strategy.footer_fields()
+    }
+    
+    # Write output file
+    write_output(output_file, output_data, entries_file)
+    
+    strategy.print_report(output_data, output_file)
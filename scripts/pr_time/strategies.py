@@ -0,0 +1,500 @@
+"""
+Time estimation strategies used by pipeline.process.
+
+ApiStrategy estimates from commit sessions fetched from the GitHub API (see
+calculate-time.md); MetadataStrategy is the fallback for when API access is
+limited and estimates from PR category, complexity and title keywords instead.
+"""
+
+import re
+from typing import AsyncIterator, Dict, Iterable, List, Protocol, Tuple
+import ahocorasick
+import numpy as np
+
+from . import github
+
+# Commit session configuration (based on calculate-time.md)
+MAX_COMMIT_DIFF_MINUTES = 120  # If commits are within 2 hours, they're part of same session
+FIRST_COMMIT_BUFFER_MINUTES = 120  # Add 2 hours to account for work before first commit
+
+
+# Commit-based estimation (ApiStrategy)
+
+def estimate_times_from_commits(commit_lists: List[List[Dict]]) -> List[Dict[str, float]]:
+    """
+    Estimate development time for many PRs at once based on commit patterns.
+    Uses the session-based algorithm described in calculate-time.md, vectorized
+    with NumPy over the commits of every PR instead of looping per commit.
+    """
+    counts = np.fromiter((len(commits) for commits in commit_lists), dtype=np.int64, count=len(commit_lists))
+    timestamps = np.fromiter((commit["ts"] for commits in commit_lists for commit in commits),
+                             dtype=np.float64, count=int(counts.sum()))
+    pr_ids = np.repeat(np.arange(len(commit_lists)), counts)
+    
+    # Gap between each commit and the previous one, attributed to the later commit's PR
+    diff_minutes = np.diff(timestamps) / 60
+    same_pr = pr_ids[1:] == pr_ids[:-1]
+    
+    # GitHub lists a PR's commits oldest first, so sorting is normally unnecessary -
+    # only fall back to it if some author date is out of order (e.g. after a rebase)
+    if np.any(same_pr & (diff_minutes < 0)):
+        order = np.lexsort((timestamps, pr_ids))
+        timestamps = timestamps[order]
+        diff_minutes = np.diff(timestamps) / 60
+    same_session = same_pr & (diff_minutes <= MAX_COMMIT_DIFF_MINUTES)
+    new_session = same_pr & ~same_session
+    
+    # Every PR with commits starts with one session; each large gap starts another
+    sessions = np.bincount(pr_ids[1:], weights=new_session, minlength=len(commit_lists)) + (counts > 0)
+    # Same session - add the time diff; each session gets a buffer for work before its first commit
+    session_minutes = np.bincount(pr_ids[1:], weights=np.where(same_session, diff_minutes, 0.0),
+                                  minlength=len(commit_lists))
+    total_minutes = session_minutes + sessions * FIRST_COMMIT_BUFFER_MINUTES
+    
+    return [
+        {
+            "estimated_hours": round(float(minutes) / 60, 1),
+            "sessions": int(session_count),
+            "commits": int(commit_count)
+        } if commit_count else {"estimated_hours": 0, "sessions": 0, "commits": 0}
+        for minutes, session_count, commit_count in zip(total_minutes, sessions, counts)
+    ]
+
+
+def estimate_time_from_commits(commits: List[Dict]) -> Dict[str, float]:
+    """
+    Estimate development time based on commit patterns.
+    Uses the session-based algorithm described in calculate-time.md
+    """
+    return estimate_times_from_commits([commits])[0]
+
+
+# Metadata-based estimation (MetadataStrategy)
+
+# Time estimation configuration based on PR patterns
+DEFAULT_DEV_HOURS = {
+    "Feature": {"Small": 12, "Medium": 20, "Large": 32},
+    "Bug_Fix": {"Small": 4, "Medium": 8, "Large": 12},
+    "Enhancement": {"Small": 6, "Medium": 10, "Large": 16},
+    "Infrastructure": {"Small": 4, "Medium": 8, "Large": 16},
+    "Refactoring": {"Small": 8, "Medium": 12, "Large": 20},
+    "Testing": {"Small": 6, "Medium": 12, "Large": 24},
+    "UI_Enhancement": {"Small": 4, "Medium": 8, "Large": 12},
+    "Documentation": {"Small": 2, "Medium": 4, "Large": 8},
+    "Security": {"Small": 4, "Medium": 8, "Large": 12},
+    "Performance": {"Small": 6, "Medium": 10, "Large": 16},
+    "Database": {"Small": 6, "Medium": 10, "Large": 16},
+    "Maintenance": {"Small": 3, "Medium": 5, "Large": 8},
+    "Hotfix": {"Small": 4, "Medium": 6, "Large": 10},
+    "Development": {"Small": 6, "Medium": 10, "Large": 16},
+}
+
+# Simulated PR body templates based on common patterns
+PR_BODY_TEMPLATES = {
+    "Feature": """## Summary
+This PR implements {feature_description} functionality.
+
+## Changes
+- Added new components for {feature}
+- Implemented business logic
+- Added unit tests
+- Updated documentation
+
+## Testing
+- Manual testing completed
+- Unit tests passing
+- Integration tests updated
+
+## Related Issues
+Closes #{issue_number}""",
+    
+    "Bug_Fix": """## Summary
+This PR fixes {bug_description}.
+
+## Root Cause
+The issue was caused by {root_cause}.
+
+## Solution
+{solution_description}
+
+## Testing
+- Verified fix resolves the issue
+- Added regression tests
+- Tested edge cases
+
+Fixes #{issue_number}""",
+    
+    "Enhancement": """## Summary
+This PR enhances {component} with {enhancement_description}.
+
+## Improvements
+- Improved performance
+- Better user experience
+- Code optimization
+
+## Testing
+- Performance benchmarks show improvement
+- User acceptance testing completed""",
+    
+    "Infrastructure": """## Summary
+Infrastructure updates for {infrastructure_component}.
+
+## Changes
+- Updated deployment configurations
+- Improved CI/CD pipeline
+- Environment configuration changes
+
+## Impact
+- No breaking changes
+- Improved deployment reliability""",
+    
+    "Default": """## Summary
+{title}
+
+## Changes
+- Implementation details based on requirements
+- Code changes as per specifications
+
+## Testing
+- Tests updated and passing
+- Manual verification completed"""
+}
+
+
+# DEFAULT_DEV_HOURS flattened into a (category, complexity) array for single-index lookups;
+# the dict is kept for the categories listed in the output
+COMPLEXITIES = ["Small", "Medium", "Large"]
+_CATEGORY_INDEX = {name: i for i, name in enumerate(DEFAULT_DEV_HOURS)}
+_COMPLEXITY_INDEX = {name: i for i, name in enumerate(COMPLEXITIES)}
+_DEV_HOURS_TABLE = np.array(
+    [[hours[complexity] for complexity in COMPLEXITIES] for hours in DEFAULT_DEV_HOURS.values()],
+    dtype=np.int8
+)
+_UNKNOWN_COMPLEXITY_HOURS = 6
+
+# Title keyword adjustments, matched in a single Aho-Corasick pass over the title
+_REFACTOR_BIT = 1 << 0
+_TEST_BIT = 1 << 1
+_FIX_BIT = 1 << 2
+_HOTFIX_BIT = 1 << 3
+_UPDATE_BIT = 1 << 4
+_MVP_BIT = 1 << 5
+_QUICK_BIT = 1 << 6  # Quick changes
+
+_TITLE_KEYWORDS = {
+    "refactor": _REFACTOR_BIT,
+    "restructure": _REFACTOR_BIT,
+    "test": _TEST_BIT,
+    "fix": _FIX_BIT,
+    "hotfix": _HOTFIX_BIT,
+    "update": _UPDATE_BIT,
+    "enhance": _UPDATE_BIT,
+    "mvp": _MVP_BIT,
+    "working": _QUICK_BIT,
+    "mid": _QUICK_BIT,
+}
+_TITLE_AUTOMATON = ahocorasick.Automaton()
+for _keyword, _bit in _TITLE_KEYWORDS.items():
+    _TITLE_AUTOMATON.add_word(_keyword, _bit)
+_TITLE_AUTOMATON.make_automaton()
+
+
+def _title_multiplier(mask: int) -> float:
+    """Decode a keyword bitmask into its combined title multiplier."""
+    multiplier = 1.0
+    if mask & _REFACTOR_BIT:
+        multiplier *= 1.2
+    if mask & _TEST_BIT:
+        multiplier *= 1.1
+    if mask & _FIX_BIT and not mask & _HOTFIX_BIT:
+        multiplier *= 0.9
+    if mask & _UPDATE_BIT:
+        multiplier *= 1.1
+    if mask & _MVP_BIT:
+        multiplier *= 1.3
+    if mask & _QUICK_BIT:
+        multiplier *= 0.7
+    return multiplier
+
+
+# Every keyword combination decoded up front, indexed by bitmask
+_TITLE_MULTIPLIERS = tuple(_title_multiplier(mask) for mask in range(_QUICK_BIT << 1))
+
+# Patterns compiled once at import rather than looked up per PR
+_ISSUE_RE = re.compile(r'#?(\d+)')
+_LEAD_NUM_RE = re.compile(r'^\d+\s*')
+_LEAD_HASH_RE = re.compile(r'^#\d+\s*')
+_PLACEHOLDER_RE = re.compile(r'\{(\w+)\}')
+_SEPARATORS_TO_SPACES = str.maketrans('_-', '  ')
+
+
+def extract_issue_number(title: str) -> str:
+    """Extract issue number from PR title"""
+    match = _ISSUE_RE.search(title)
+    return match.group(1) if match else "N/A"
+
+
+def generate_simulated_pr_body(pr: Dict) -> str:
+    """Generate a simulated PR body based on PR metadata"""
+    category = pr.get("category", "Default")
+    title = pr.get("title", "")
+    
+    template = PR_BODY_TEMPLATES.get(category, PR_BODY_TEMPLATES["Default"])
+    
+    # Extract information from title
+    issue_number = extract_issue_number(title)
+    
+    # Clean up title for description
+    description = _LEAD_NUM_RE.sub('', title)  # Remove leading numbers
+    description = _LEAD_HASH_RE.sub('', description)  # Remove issue references
+    description = description.lower().translate(_SEPARATORS_TO_SPACES)
+    words = description.split()
+    
+    # Fill in template placeholders
+    replacements = {
+        "feature_description": description,
+        "feature": words[0] if words else "feature",
+        "bug_description": description,
+        "root_cause": "incorrect state handling",
+        "solution_description": f"Updated logic to properly handle {description}",
+        "component": words[0] if words else "component",
+        "enhancement_description": description,
+        "infrastructure_component": description,
+        "title": title,
+        "issue_number": issue_number
+    }
+    
+    # Single pass over the template; unknown placeholders are left as-is
+    return _PLACEHOLDER_RE.sub(lambda m: replacements.get(m.group(1), m.group(0)), template)
+
+
+def estimate_time_from_metadata(pr: Dict) -> Dict:
+    """
+    Estimate time based on PR metadata when commit data is not available.
+    Uses category and complexity to determine estimates.
+    """
+    category = pr.get("category", "Maintenance")
+    complexity = pr.get("complexity", "Small")
+    
+    # Get base hours from lookup table
+    category_index = _CATEGORY_INDEX.get(category, _CATEGORY_INDEX["Maintenance"])
+    complexity_index = _COMPLEXITY_INDEX.get(complexity)
+    if complexity_index is None:
+        base_hours = _UNKNOWN_COMPLEXITY_HOURS
+    else:
+        base_hours = int(_DEV_HOURS_TABLE[category_index, complexity_index])
+    
+    # Adjust based on title indicators; overlapping matches ("fix" inside "hotfix") are all reported
+    mask = 0
+    for _, bit in _TITLE_AUTOMATON.iter(pr.get("title", "").lower()):
+        mask |= bit
+    
+    estimated_hours = round(base_hours * _TITLE_MULTIPLIERS[mask], 1)
+    
+    # Estimate sessions based on complexity (Small: 1, Medium: 2, Large: 3)
+    sessions = complexity_index + 1 if complexity_index is not None else 1
+    
+    # Estimate commits based on hours (roughly 1 commit per 2 hours of work)
+    estimated_commits = max(1, round(estimated_hours / 2))
+    
+    return {
+        "estimated_hours": estimated_hours,
+        "sessions": sessions,
+        "commits": estimated_commits,
+        "method": "metadata_based",
+        "confidence": "low"  # Since we don't have actual commit data
+    }
+
+
+class TimeEstimator(Protocol):
+    """
+    A way of estimating development time for PRs.
+    pipeline.process streams PRs into estimate() and assembles the output
+    file around the fields each strategy contributes.
+    """
+    
+    def print_intro(self, total_prs: int):
+        """Print what the run is about to do"""
+    
+    def estimate(self, data: Dict, prs: Iterable[Dict]) -> AsyncIterator[Tuple[Dict, Dict]]:
+        """Yield (pr, fields to add to it) for each PR in input order; fields must include github_estimate"""
+    
+    def header_fields(self) -> Dict:
+        """Top-level output fields written before the input summary"""
+    
+    def summary_fields(self, data: Dict, total_hours: float, total_sessions: int,
+                       total_commits: int, total_prs: int) -> Dict:
+        """Estimation summary and config, given the summed estimates of all PRs"""
+    
+    def footer_fields(self) -> Dict:
+        """Top-level output fields written after the methodology"""
+    
+    def print_report(self, output_data: Dict, output_file: str):
+        """Print the final summary"""
+
+
+class ApiStrategy:
+    """Estimate time from commit sessions fetched from the GitHub API"""
+    
+    def __init__(self, owner: str):
+        self.owner = owner
+    
+    def print_intro(self, total_prs: int):
+        print(f"Processing {total_prs} pull requests...")
+    
+    async def estimate(self, data: Dict, prs: Iterable[Dict]) -> AsyncIterator[Tuple[Dict, Dict]]:
+        repo_name = data.get("repository", "patient-scheduling-solution")
+        async for results in github.iter_pr_chunks(self.owner, repo_name, prs):
+            # Estimate time from commits for each chunk of PRs in one vectorized pass
+            time_estimates = estimate_times_from_commits([commits for _, _, commits in results])
+            
+            for (pr, pr_body, commits), time_estimate in zip(results, time_estimates):
+                existing_dev_hours = pr.get("dev_hours", 0)
+                
+                if commits:
+                    # Compare with existing estimate
+                    estimated_hours = time_estimate["estimated_hours"]
+                    estimate_comparison = {
+                        "existing_dev_hours": existing_dev_hours,
+                        "github_estimated_hours": estimated_hours,
+                        "difference": round(estimated_hours - existing_dev_hours, 1)
+                    }
+                else:
+                    time_estimate = {
+                        "estimated_hours": 0,
+                        "sessions": 0,
+                        "commits": 0,
+                        "note": "No commit data available"
+                    }
+                    estimate_comparison = {
+                        "existing_dev_hours": existing_dev_hours,
+                        "github_estimated_hours": 0,
+                        "difference": 0
+                    }
+                
+                yield pr, {
+                    "pr_body": pr_body if pr_body else "",
+                    "github_estimate": time_estimate,
+                    "estimate_comparison": estimate_comparison
+                }
+    
+    def header_fields(self) -> Dict:
+        return {}
+    
+    def summary_fields(self, data: Dict, total_hours: float, total_sessions: int,
+                       total_commits: int, total_prs: int) -> Dict:
+        return {
+            "github_estimation_summary": {
+                "total_github_estimated_hours": total_hours,
+                "total_original_dev_hours": data["summary"]["total_estimated_dev_hours"],
+                "average_sessions_per_pr": round(total_sessions / total_prs, 1) if total_prs > 0 else 0,
+                "average_commits_per_pr": round(total_commits / total_prs, 1) if total_prs > 0 else 0
+            },
+            "estimation_config": {
+                "max_commit_diff_minutes": MAX_COMMIT_DIFF_MINUTES,
+                "first_commit_buffer_minutes": FIRST_COMMIT_BUFFER_MINUTES,
+                "method": "Commit session analysis as per calculate-time.md"
+            }
+        }
+    
+    def footer_fields(self) -> Dict:
+        return {}
+    
+    def print_report(self, output_data: Dict, output_file: str):
+        print(f"\nCompleted! Enhanced data written to {output_file}")
+        print(f"Total GitHub estimated hours: {output_data['github_estimation_summary']['total_github_estimated_hours']:.1f}")
+        print(f"Original estimated dev hours: {output_data['github_estimation_summary']['total_original_dev_hours']}")
+
+
+class MetadataStrategy:
+    """Estimate time from PR metadata when commit data is not available"""
+    
+    def print_intro(self, total_prs: int):
+        print(f"Processing {total_prs} pull requests using fallback estimation...")
+        print("Note: Using metadata-based estimation since GitHub API access is limited.\n")
+    
+    async def estimate(self, data: Dict, prs: Iterable[Dict]) -> AsyncIterator[Tuple[Dict, Dict]]:
+        for pr in prs:
+            # Estimate time based on metadata and generate simulated PR body
+            time_estimate = estimate_time_from_metadata(pr)
+            pr_body = generate_simulated_pr_body(pr)
+            
+            # Compare with existing estimate
+            existing_dev_hours = pr.get("dev_hours", 0)
+            estimated_hours = time_estimate["estimated_hours"]
+            difference = estimated_hours - existing_dev_hours
+            if existing_dev_hours > 0:
+                percentage_diff = round(difference / existing_dev_hours * 100, 1)
+            else:
+                percentage_diff = 0
+            
+            yield pr, {
+                "pr_body": pr_body,
+                "pr_body_source": "simulated",
+                "github_estimate": time_estimate,
+                "estimate_comparison": {
+                    "existing_dev_hours": existing_dev_hours,
+                    "metadata_estimated_hours": estimated_hours,
+                    "difference": round(difference, 1),
+                    "percentage_diff": percentage_diff
+                }
+            }
+    
+    def header_fields(self) -> Dict:
+        return {
+            "estimation_method": "fallback_metadata_based",
+            "note": "Estimates based on PR metadata due to limited GitHub API access"
+        }
+    
+    def summary_fields(self, data: Dict, total_hours: float, total_sessions: int,
+                       total_commits: int, total_prs: int) -> Dict:
+        total_original = data["summary"]["total_estimated_dev_hours"]
+        return {
+            "metadata_estimation_summary": {
+                "total_metadata_estimated_hours": round(total_hours, 1),
+                "total_original_dev_hours": total_original,
+                "difference_hours": round(total_hours - total_original, 1),
+                "percentage_difference": round(
+                    ((total_hours - total_original) / total_original * 100), 1
+                ),
+                "average_sessions_per_pr": round(total_sessions / total_prs, 1) if total_prs > 0 else 0,
+                "average_commits_per_pr": round(total_commits / total_prs, 1) if total_prs > 0 else 0,
+                "confidence_level": "low - based on patterns not actual commit data"
+            },
+            "estimation_config": {
+                "method": "Metadata-based estimation using category, complexity, and title patterns",
+                "categories_used": list(DEFAULT_DEV_HOURS.keys()),
+                "complexities": COMPLEXITIES,
+                "note": "Actual commit-based estimation would be more accurate with GitHub API access"
+            }
+        }
+    
+    def footer_fields(self) -> Dict:
+        return {
+            "fallback_methodology": {
+                "description": "Since GitHub API access is limited, estimates are based on:",
+                "factors": [
+                    "PR category (Feature, Bug_Fix, etc.)",
+                    "Complexity (Small, Medium, Large)",
+                    "Title keywords (refactor, test, fix, enhance, etc.)",
+                    "Historical patterns from similar PRs"
+                ],
+                "limitations": [
+                    "No actual commit timing data",
+                    "Cannot account for actual work sessions",
+                    "PR bodies are simulated based on templates",
+                    "Estimates may vary from actual time spent"
+                ]
+            }
+        }
+    
+    def print_report(self, output_data: Dict, output_file: str):
+        summary = output_data["metadata_estimation_summary"]
+        print(f"\n✅ Completed! Enhanced data written to {output_file}")
+        print(f"\n📊 Summary:")
+        print(f"   Total PRs processed: {output_data['total_prs']}")
+        print(f"   Metadata estimated hours: {summary['total_metadata_estimated_hours']}")
+        print(f"   Original estimated dev hours: {summary['total_original_dev_hours']}")
+        print(f"   Difference: {summary['difference_hours']} hours")
+        print(f"\n⚠️  Note: These are fallback estimates. For more accurate results,")
+        print(f"   ensure your GitHub token has access to the repository.")